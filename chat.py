@@ -1,12 +1,15 @@
-# Last Updated: 2026-01-07
+# Last Updated: 2026-10-15
 # Description: Redis-based CLI Chat Application with Gemini AI integration
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.exceptions import MaxRetryError
 import json
 import time
 import threading
 import re
-import os
+import queue
 from datetime import datetime
 from dotenv import load_dotenv
 from colorama import Fore, Style, init
@@ -14,15 +17,34 @@ import ctypes
 import platform
 import random
 import sys
+from collections import deque, namedtuple
+from itertools import islice
+
+# Glitch replacement characters; 8 entries so getrandbits(3) indexes directly
+GLITCH_CHARS = "#$%&0101"
 
 class Effects:
     @staticmethod
     def typewriter(text, speed=0.03, color=Fore.GREEN):
         """Print text character by character"""
-        for char in text:
-            sys.stdout.write(color + char)
+        # Write whatever is due at most once per ~16ms frame (color re-sent since autoreset clears it)
+        frame = 0.016
+        start = time.perf_counter()
+        written = 0
+        while written < len(text):
+            if speed > 0:
+                due = int((time.perf_counter() - start) / speed) + 1
+                due = min(len(text), max(due, written + 1))
+            else:
+                due = len(text)
+            sys.stdout.write(color + text[written:due])
             sys.stdout.flush()
-            time.sleep(speed)
+            written = due
+            
+            if written < len(text):
+                now = time.perf_counter()
+                delay = max(start + written * speed, now + frame) - now
+                time.sleep(delay)
         print() # Newline at end
 
     @staticmethod
@@ -31,57 +53,96 @@ class Effects:
         lines = banner_text.split('\n')
         end_time = time.time() + duration
         
+        # Paint the full banner once; frames below only repaint the rows that change
+        print('\033[H', end='')
+        print(Fore.MAGENTA + Style.NORMAL + banner_text + Style.RESET_ALL)
+        
+        def paint(row, color, text):
+            # Jump to the row, draw it, clear whatever the previous frame left behind
+            return f"\033[{row + 1};1H{color}{text}\033[K{Style.RESET_ALL}"
+        
+        dirty = []  # Rows drawn highlighted/glitched last frame
         while time.time() < end_time:
-            # Clear screen (cursor home)
-            print('\033[H', end='')
+            # Restore last frame's rows to normal purple
+            frame = [paint(row, Fore.MAGENTA + Style.NORMAL, lines[row]) for row in dirty]
+            dirty = []
             
             # Random bright scanline position
             scanline = random.randint(0, len(lines)-1)
+            # Bright white line for scanline effect
+            frame.append(paint(scanline, Fore.WHITE + Style.BRIGHT, lines[scanline]))
+            dirty.append(scanline)
             
             for i, line in enumerate(lines):
-                if i == scanline:
-                    # Bright white line for scanline effect
-                    print(Fore.WHITE + Style.BRIGHT + line + Style.RESET_ALL)
-                else:
-                    # Normal purple for rest
-                    # Occasionally glitch a character
-                    if random.random() < 0.02:
-                        glitched = list(line)
-                        if glitched:
-                            idx = random.randint(0, len(glitched)-1)
-                            glitched[idx] = random.choice(['#', '$', '%', '&', '0', '1'])
-                            print(Fore.MAGENTA + Style.DIM + "".join(glitched) + Style.RESET_ALL)
-                        else:
-                            print(Fore.MAGENTA + Style.DIM + line + Style.RESET_ALL)
-                    else:
-                        print(Fore.MAGENTA + Style.NORMAL + line + Style.RESET_ALL)
+                # Occasionally glitch a character on the other rows
+                # (1 in 64 chance, integer draw instead of a float compare)
+                if i != scanline and random.getrandbits(6) == 0:
+                    glitched = list(line)
+                    if glitched:
+                        idx = random.randint(0, len(glitched)-1)
+                        glitched[idx] = GLITCH_CHARS[random.getrandbits(3)]
+                    frame.append(paint(i, Fore.MAGENTA + Style.DIM, "".join(glitched)))
+                    dirty.append(i)
             
+            # One write per frame: a couple of rows instead of the whole banner
+            sys.stdout.write("".join(frame))
+            sys.stdout.flush()
             time.sleep(0.05)
         
         # Final clean render
         print('\033[H', end='')
         print(Fore.MAGENTA + Style.BRIGHT + banner_text + Style.RESET_ALL)
 
-    @staticmethod
-    def spinner(text, duration=2.0):
-        """Show animated spinner"""
+
+class SpinnerService:
+    """One persistent spinner thread; start()/stop() toggle it without blocking the caller"""
+    def __init__(self):
+        self.text = ""
+        self.thread = None
+        self.spinning = threading.Event()
+        self.stopping = threading.Event()
+        self.stopped = threading.Event()
+
+    def start(self, text):
+        """Show the spinner with text and return immediately"""
+        self.text = text
+        self.stopped.clear()
+        self.stopping.clear()
+        self.spinning.set()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.spin, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Finish the spinner line; returns once it has been replaced by a ✓"""
+        if self.spinning.is_set():
+            self.stopping.set()
+            self.stopped.wait()
+
+    def spin(self):
         chars = "|/-\\"
-        end_time = time.time() + duration
-        i = 0
-        while time.time() < end_time:
-            time.sleep(0.1)
-            # \r to return to start of line
-            sys.stdout.write(f"\r{Fore.MAGENTA}{chars[i % 4]} {Fore.GREEN}{text}")
+        while True:
+            self.spinning.wait()
+            i = 0
+            while not self.stopping.is_set():
+                # \r to return to start of line
+                sys.stdout.write(f"\r{Fore.MAGENTA}{chars[i % 4]} {Fore.GREEN}{self.text}")
+                sys.stdout.flush()
+                i += 1
+                self.stopping.wait(0.1)
+            # Clear spinner line
+            self.spinning.clear()
+            sys.stdout.write(f"\r{Fore.GREEN}✓ {self.text}          \n")
             sys.stdout.flush()
-            i += 1
-        # Clear spinner line
-        sys.stdout.write(f"\r{Fore.GREEN}✓ {text}          \n")
-        sys.stdout.flush()
+            self.stopped.set()
 
 
+# Checked once at import; the Win32-only paths below key off it
+IS_WINDOWS = platform.system() == "Windows"
+
 def enable_vt_processing():
     """Enable VT100 emulation on Windows"""
-    if platform.system() == "Windows":
+    if IS_WINDOWS:
         try:
             kernel32 = ctypes.windll.kernel32
             # ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
@@ -97,12 +158,69 @@ def enable_vt_processing():
 
 enable_vt_processing()
 
+def get_focus_handles():
+    """Resolve the console window handle and GetForegroundWindow once (Windows only)"""
+    if IS_WINDOWS:
+        try:
+            get_console_window = ctypes.windll.kernel32.GetConsoleWindow
+            get_console_window.restype = ctypes.c_void_p
+            get_foreground_window = ctypes.windll.user32.GetForegroundWindow
+            get_foreground_window.restype = ctypes.c_void_p
+            return get_console_window(), get_foreground_window
+        except:
+            pass
+    return None, None
+
+# Cached so focus checks skip the windll attribute lookups on every batch
+CONSOLE_HWND, GET_FOREGROUND_WINDOW = get_focus_handles()
+
 try:
     from plyer import notification
     PLYER_AVAILABLE = True
 except ImportError:
     PLYER_AVAILABLE = False
 
+# Faster JSON for the message hot path; falls back to the stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def json_dumps(obj):
+    """Serialize obj to a JSON string"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+def json_body(obj):
+    """Serialize obj to UTF-8 JSON bytes for an HTTP request body"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# A decoded chat message. Fields missing from the payload (private-message
+# fields are only sent when set) take these defaults.
+Msg = namedtuple(
+    "Msg", "username message timestamp recipients is_silent",
+    defaults=("Unknown", "", "", (), False)
+)
+
+def to_msg(data):
+    """Build a Msg from a decoded payload dict, coercing fields to the types the display code expects"""
+    # Stored payloads come from any client, so null or mistyped fields are
+    # normalized here rather than failing later in format_message
+    recipients = data.get("recipients")
+    return Msg(
+        str(data.get("username") or "Unknown"),
+        str(data.get("message") or ""),
+        str(data.get("timestamp") or ""),
+        tuple(recipients) if isinstance(recipients, list) else (),
+        bool(data.get("is_silent"))
+    )
+
 
 try:
     import warnings
@@ -112,9 +230,6 @@ try:
 except ImportError:
     GEMINI_AVAILABLE = False
     
-# Windows ANSI Fix
-os.system('')
-
 try:
     from prompt_toolkit import PromptSession
     from prompt_toolkit.completion import Completer, Completion
@@ -125,29 +240,15 @@ try:
     from prompt_toolkit.lexers import Lexer
     PROMPT_TOOLKIT_AVAILABLE = True
 
+    # One pass over the input line: /commands, @mentions, plain words and spaces
+    LEXER_TOKEN_RE = re.compile(r'(?P<command>/[^ ]*)|(?P<mention>@[^ ]*)|(?P<text>[^ ]+)|(?P<space> +)')
+    LEXER_STYLES = {'command': 'class:command', 'mention': 'class:mention', 'text': 'class:text', 'space': ''}
+
     class CommandLexer(Lexer):
         def lex_document(self, document):
             def get_line_tokens(lineno):
                 line = document.lines[lineno]
-                tokens = []
-                # Simple tokenization by splitting on space to find commands
-                # This is a basic implementation
-                parts = line.split(' ')
-                current_len = 0
-                
-                for i, part in enumerate(parts):
-                    if part.startswith('/'):
-                        tokens.append(('class:command', part))
-                    elif part.startswith('@'):
-                        tokens.append(('class:mention', part))
-                    else:
-                        tokens.append(('class:text', part))
-                    
-                    # Add space if not the last part
-                    if i < len(parts) - 1:
-                        tokens.append(('', ' '))
-                
-                return tokens
+                return [(LEXER_STYLES[m.lastgroup], m.group()) for m in LEXER_TOKEN_RE.finditer(line)]
             return get_line_tokens
 
 except ImportError:
@@ -157,8 +258,10 @@ except ImportError:
 # strip=False ensures we send raw ANSI codes which prompt_toolkit/Windows Terminal can handle
 init(autoreset=True, strip=False)
 
-# Load environment variables
-load_dotenv()
+# Load environment variables, skipping the .env read when they're already set
+# (injected by the shell/container, or a repeat import)
+if not ("UPSTASH_REDIS_REST_URL" in os.environ and "UPSTASH_REDIS_REST_TOKEN" in os.environ):
+    load_dotenv()
 
 # Redis Configuration (Loaded from .env)
 REDIS_URL = os.getenv("UPSTASH_REDIS_REST_URL")
@@ -178,10 +281,47 @@ if not REDIS_URL or not REDIS_TOKEN:
     input("Press Enter to exit...")
     exit(1)
 
-CHAT_KEY = "chat:messages"
+PIPELINE_URL = f"{REDIS_URL}/pipeline"
+
+# Redis Stream holding the chat log (entries: data=<message json>)
+CHAT_STREAM_KEY = "chat:stream"
+# Approximate cap on stored messages; "~" lets Redis trim whole nodes cheaply
+STREAM_MAXLEN = 10000
+# Presence: one HyperLogLog per 15 second bucket; online = seen in the
+# current or previous bucket
+PRESENCE_KEY = "chat:presence:hll:{}"
+PRESENCE_BUCKET_SECONDS = 15
+# Pre-serialized polling bodies; only JSON-safe ints and stream IDs are spliced in
+XREAD_BODY = ('["XREAD","BLOCK",%d,"COUNT",100,"STREAMS",'
+              + json_dumps(CHAT_STREAM_KEY) + ',"%s"]').encode()
+PRESENCE_KEY_JSON = json_dumps(PRESENCE_KEY).replace("{}", "%d")
 USERS_KEY = "chat:users"
 GEMINI_QUEUE_KEY = "chat:gemini:queue"
-GEMINI_RESPONSE_KEY = "chat:gemini:response:{}"
+# Per-prompt result list: the worker RPUSHes the JSON result (with an EXPIRE)
+GEMINI_RESULT_KEY = "chat:gemini:result:{}"
+# Key older workers SET the result under; still checked between short BLPOP
+# windows until every deployed worker pushes to GEMINI_RESULT_KEY
+GEMINI_LEGACY_RESPONSE_KEY = "chat:gemini:response:{}"
+GEMINI_BLPOP_WINDOW = 2
+# Outgoing messages are pipelined in batches of up to SEND_BATCH_SIZE; a
+# batch that safely can be resent gets SEND_RETRIES attempts in total
+SEND_BATCH_SIZE = 16
+SEND_RETRIES = 3
+# Stream reconnect backoff bounds, in seconds
+BACKOFF_MIN = 0.25
+BACKOFF_MAX = 16
+
+# Mention patterns, compiled once instead of per message
+MENTION_RE = re.compile(r'@\w+')
+MENTION_CAPTURE_RE = re.compile(r'@(\w+)')
+
+# Prebuilt message line templates, so display_message does one format() call
+# instead of assembling the color segments per message
+MESSAGE_TEMPLATE = f"{PRIMARY_COLOR}[{{ts}}] {USERNAME_COLOR}{{user}}{PRIMARY_COLOR}: {PRIMARY_COLOR}{{msg}}"
+SILENT_MESSAGE_TEMPLATE = f"{PRIMARY_COLOR}[{{ts}}] {SILENT_COLOR}[SILENT] {USERNAME_COLOR}{{user}}{PRIMARY_COLOR}: {SILENT_COLOR}{{msg}}"
+# Mention highlight replacements, restoring the surrounding message color
+MENTION_REPL = f"{MENTION_COLOR}\\g<0>{PRIMARY_COLOR}"
+SILENT_MENTION_REPL = f"{MENTION_COLOR}\\g<0>{SILENT_COLOR}"
 
 # Custom Completer for @mentions
 class UserCompleter(Completer):
@@ -190,7 +330,8 @@ class UserCompleter(Completer):
 
     def get_completions(self, document, complete_event):
         text = document.text_before_cursor
-        word = text.split(' ')[-1]
+        # Last word without splitting the whole line on every keystroke
+        word = text[text.rfind(' ') + 1:]
         
         if word.startswith('@'):
             search = word[1:].lower()
@@ -206,28 +347,79 @@ class UserCompleter(Completer):
 
 class RedisChat:
     def __init__(self):
-        self.headers = {
+        # Pooled keep-alive session shared by the main, sender and presence threads
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            pool_block=False,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
+        self.session.headers.update({
             "Authorization": f"Bearer {REDIS_TOKEN}",
             "Content-Type": "application/json"
-        }
+        })
+        
+        # Separate single-connection session for the blocking XREAD (stream_updates does its own retries)
+        self.stream_session = requests.Session()
+        self.stream_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self.stream_session.headers.update(self.session.headers)
+        # Bound once: the hot paths call these on every request
+        self.post = self.session.post
+        self.stream_post = self.stream_session.post
+        
+        self.spinner = SpinnerService()
         self.username = None
-        self.running = True
+        self.username_mention = None  # "@name" lowercased, for mention alerts
+        # Set on quit; background threads wait on it so they wake immediately
+        self.stop_event = threading.Event()
         self.message_counter = 0
         self.known_users = set()
         self.users_lock = threading.Lock()
+        # Completion list cache: rebuilt only when known_users actually changes,
+        # not on every keystroke of an @mention
+        self.users_version = 0
+        self.users_cache = (-1, [])
+        # Local copy of recent messages (newest first), kept current by the
+        # subscription so /history doesn't have to refetch from Redis
+        self.history = deque(maxlen=200)
+        self.history_loaded = False
+        self.history_lock = threading.Lock()
+        # ID of the newest stream entry we've seen; XREAD resumes from here
+        self.last_id = None
+        # Current reconnect delay for the stream reader, see sleep_backoff
+        self.backoff = BACKOFF_MIN
         self.active_user_count = 1
+        # Outgoing message payloads, drained by sender_loop so the
+        # prompt never waits on a write round trip
+        self.send_q = queue.Queue()
+        self.sender_thread = None
+        # Raw XREAD batches from stream_updates, waiting for display_updates
+        self.rx_q = queue.Queue(maxsize=256)
+        # (active_user_count, prompt) so the prompt is only rebuilt on change
+        self.prompt_cache = (None, None)
+        # ((year, month, day), "YYYY-MM-DD ") so only the clock part is formatted per send
+        self.date_cache = (None, "")
             
     def update_known_users(self, users_list=None):
         if users_list:
             with self.users_lock:
+                before = len(self.known_users)
                 self.known_users.update(users_list)
+                if len(self.known_users) != before:
+                    self.users_version += 1
                 
     def get_known_users(self):
+        version, users = self.users_cache
+        if version == self.users_version:
+            return users
+        
         with self.users_lock:
             # Always include 'everyone'
-            full_list = {'everyone'} | self.known_users
             # Exclude self if possible, but for mentions self is okay
-            return list(full_list)
+            users = sorted({'everyone'} | self.known_users)
+            self.users_cache = (self.users_version, users)
+            return users
 
     def register_user(self):
         """Add self to active users list"""
@@ -236,14 +428,17 @@ class RedisChat:
         
     def is_window_focused(self):
         """Check if the terminal window is in foreground"""
+        # No focus API off Windows: treat as focused so no notifications fire
+        if not IS_WINDOWS:
+            return True
+        if not CONSOLE_HWND:
+            return False
         try:
-            hwnd = ctypes.windll.kernel32.GetConsoleWindow()
-            if hwnd == 0: return False
-            return hwnd == ctypes.windll.user32.GetForegroundWindow()
+            return CONSOLE_HWND == GET_FOREGROUND_WINDOW()
         except:
             return False
         
-    def redis_request(self, command, args=None):
+    def redis_request(self, command, args=None, timeout=5):
         """Make HTTP request to Upstash Redis REST API"""
         try:
             # Format: ["COMMAND", "arg1", "arg2", ...]
@@ -251,25 +446,51 @@ class RedisChat:
             if args:
                 cmd_list.extend(args)
             
-            response = requests.post(
-                f"{REDIS_URL}",
-                json=cmd_list,
-                headers=self.headers,
-                timeout=5
+            response = self.post(
+                REDIS_URL,
+                data=json_body(cmd_list),
+                timeout=timeout
             )
             
             if response.status_code == 200:
-                return response.json()
+                return json_loads(response.content)
             else:
                 print(PRIMARY_COLOR + f"Redis error: {response.status_code} - {response.text}")
                 return None
         except Exception as e:
             print(PRIMARY_COLOR + f"Connection error: {e}")
             return None
+
+    def redis_pipeline(self, commands):
+        """Run command lists (or a pre-serialized body) in one /pipeline round trip; None on failure"""
+        try:
+            response = self.post(
+                PIPELINE_URL,
+                data=commands if isinstance(commands, bytes) else json_body(commands),
+                timeout=5
+            )
+
+            if response.status_code == 200:
+                return json_loads(response.content)
+            else:
+                print(PRIMARY_COLOR + f"Redis error: {response.status_code} - {response.text}")
+                return None
+        except Exception as e:
+            print(PRIMARY_COLOR + f"Connection error: {e}")
+            return None
+    
+    def timestamp(self):
+        """Current local time as "YYYY-MM-DD HH:MM:SS", without strftime"""
+        t = time.localtime()
+        date, prefix = self.date_cache
+        if date != t[:3]:
+            prefix = "%04d-%02d-%02d " % t[:3]
+            self.date_cache = (t[:3], prefix)
+        return prefix + "%02d:%02d:%02d" % (t.tm_hour, t.tm_min, t.tm_sec)
     
     def send_message(self, message):
         """Send a message to the chat handling mentions and silent mode"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = self.timestamp()
         
         # Parse for /silent and recipients
         recipients = []
@@ -282,7 +503,7 @@ class RedisChat:
             display_text = message.replace("/silent", "").strip()
             # If silent, whoever is mentioned is a recipient
             # We assume mentions are in the format @username
-            matches = re.findall(r'@(\w+)', message)
+            matches = MENTION_CAPTURE_RE.findall(message)
             if matches:
                  recipients = matches
             else:
@@ -293,77 +514,146 @@ class RedisChat:
         msg_data = {
             "username": self.username,
             "message": display_text,
-            "timestamp": timestamp,
-            "recipients": recipients if is_silent else [],
-            "is_silent": is_silent
+            "timestamp": timestamp
         }
+        # Private-message fields only travel when set; readers default them
+        # to [] / False, which keeps the common payload small
+        if is_silent:
+            msg_data["recipients"] = recipients
+            msg_data["is_silent"] = True
         
-        msg_json = json.dumps(msg_data)
-        result = self.redis_request("LPUSH", [CHAT_KEY, msg_json])
-        
-        if result:
-            if is_silent:
-                print(SILENT_COLOR + "✓ Silent message sent")
-            else:
-                print(PRIMARY_COLOR + "✓ Message sent")
+        # Optimistic: the sender thread does the write, failures are
+        # reported from there
+        self.send_q.put(json_dumps(msg_data))
+        if is_silent:
+            print(SILENT_COLOR + "✓ Silent message sent")
         else:
-            print(ERROR_COLOR + "✗ Failed to send message")
+            print(PRIMARY_COLOR + "✓ Message sent")
     
-    def get_message_history(self, count=10):
-        """Get chat history from Redis"""
-        result = self.redis_request("LRANGE", [CHAT_KEY, 0, count - 1])
-        
-        if result and result.get("result"):
-            messages = []
-            for msg_str in result["result"]:
+    def sender_loop(self):
+        """Background thread writing queued messages, pipelined in batches"""
+        batch = []
+        attempts = 0
+        # Keep going after quit until everything queued is written or given up on
+        while batch or not (self.stop_event.is_set() and self.send_q.empty()):
+            # A failed batch is retried as-is before anything newer is taken,
+            # so messages land in the order they were typed
+            if not batch:
                 try:
-                    msg = json.loads(msg_str)
-                    messages.append(msg)
-                except:
+                    batch = [self.send_q.get(timeout=0.5)]
+                except queue.Empty:
+                    continue
+                # Coalesce whatever else was typed meanwhile into the same POST
+                try:
+                    while len(batch) < SEND_BATCH_SIZE:
+                        batch.append(self.send_q.get_nowait())
+                except queue.Empty:
                     pass
-            return messages
+                attempts = 0
+            
+            batch = self.write_batch(batch)
+            attempts += 1
+            if batch and attempts >= SEND_RETRIES:
+                for _ in batch:
+                    print(ERROR_COLOR + "✗ Failed to send message")
+                batch = []
+            if batch:
+                self.stop_event.wait(1)
+    
+    def write_batch(self, payloads):
+        """XADD payloads in one pipeline; returns the ones that failed and are safe to resend"""
+        cmds = [["XADD", CHAT_STREAM_KEY, "MAXLEN", "~", STREAM_MAXLEN, "*", "data", payload]
+                for payload in payloads]
+        try:
+            response = self.post(PIPELINE_URL, data=json_body(cmds), timeout=5)
+            response.raise_for_status()
+            results = json_loads(response.content)
+        except requests.ConnectionError as e:
+            # The adapter's Retry wraps connect-phase failures in MaxRetryError
+            # once it gives up: Upstash never got the request, so resending is safe
+            if e.args and isinstance(e.args[0], MaxRetryError):
+                return payloads
+            error = e
+        except (requests.RequestException, ValueError) as e:
+            error = e
+        else:
+            # A per-command error means that XADD wasn't applied
+            return [payload for payload, result in zip(payloads, results) if "error" in result]
+        
+        # Sent but outcome unknown: resending could duplicate, so report instead
+        print(ERROR_COLOR + f"✗ {len(payloads)} message(s) may not have been sent: {error}")
         return []
     
-    def display_message(self, msg):
-        """Display a single message with formatting"""
-        username = msg.get("username", "Unknown")
-        message = msg.get("message", "")
-        timestamp = msg.get("timestamp", "")
-        recipients = msg.get("recipients", [])
-        is_silent = msg.get("is_silent", False)
+    def get_message_history(self, count=10):
+        """Get chat history from Redis (newest first), or None if the request failed"""
+        result = self.redis_request("XREVRANGE", [CHAT_STREAM_KEY, "+", "-", "COUNT", count])
+        if result is None:
+            return None
+        
+        entries = result.get("result") or []
+        # First fetch: the live stream resumes right after the newest entry
+        # shown here, so nothing can fall between history and the first XREAD
+        if self.last_id is None:
+            self.last_id = entries[0][0] if entries else "0-0"
+        return self.decode_messages(self.entry_payloads(entries))
+    
+    def entry_payloads(self, entries):
+        """Extract the message JSON from [id, [field, value, ...]] stream entries"""
+        payloads = []
+        for entry_id, fields in entries:
+            data = dict(zip(fields[::2], fields[1::2])).get("data")
+            if data is not None:
+                payloads.append(data)
+        return payloads
+    
+    def decode_messages(self, raw_messages):
+        """Parse raw JSON message strings, skipping malformed entries"""
+        messages = []
+        for msg_str in raw_messages or []:
+            # Each entry is decoded on its own so one payload can never bleed into another
+            try:
+                messages.append(to_msg(json_loads(msg_str)))
+            except (ValueError, AttributeError, TypeError):
+                pass
+        return messages
+    
+    def format_message(self, msg):
+        """Build the colored display line for a message, or None if it's hidden from us"""
+        username, message, timestamp, recipients, is_silent = msg
         
         # VISIBILITY CHECK
         # If silent, only show if I am the sender OR I am in recipients
         if is_silent:
             if self.username != username and self.username not in recipients:
-                return
-
-        # Formatting
-        display_prefix = ""
-        user_color = USERNAME_COLOR
-        msg_color = PRIMARY_COLOR # Default message color (Green)
-
-        if is_silent:
-            display_prefix = f"{SILENT_COLOR}[SILENT] "
-            msg_color = SILENT_COLOR # Silent messages in Magenta
+                return None
+            # Formatting: silent messages get the [SILENT] prefix and Magenta text
+            template, mention_repl = SILENT_MESSAGE_TEMPLATE, SILENT_MENTION_REPL
+        else:
+            template, mention_repl = MESSAGE_TEMPLATE, MENTION_REPL
 
         # Highlight mentions in the message body
-        # logic: replace @MyName with colored version
-        if self.username:
-            # Highlight all mentions (words starting with @)
-            def replace_mention(match):
-                mention_text = match.group(0)
-                # If it is @everyone or @any_other_user, color it yellow
-                return f"{MENTION_COLOR}{mention_text}{msg_color}"
-            
-            message = re.sub(r'@\w+', replace_mention, message)
+        # logic: replace @MyName with colored version (skipped when there's no '@')
+        if self.username and '@' in message:
+            # Highlight all mentions (words starting with @), @everyone included
+            message = MENTION_RE.sub(mention_repl, message)
 
-        final_str = f"{PRIMARY_COLOR}[{timestamp}] {display_prefix}{user_color}{username}{PRIMARY_COLOR}: {msg_color}{message}"
+        return template.format(ts=timestamp, user=username, msg=message)
+    
+    def display_messages_batch(self, messages, header=None):
+        """Display messages in order as a single write"""
+        lines = [header] if header else []
+        for msg in messages:
+            line = self.format_message(msg)
+            if line is not None:
+                lines.append(line)
+        if not lines:
+            return
         
+        output = "\n".join(lines)
         if PROMPT_TOOLKIT_AVAILABLE:
-            print_formatted_text(ANSI(final_str))
+            print_formatted_text(ANSI(output))
         else:
-            print(final_str)
+            print(output)
     
     def show_history(self):
         """Display chat history"""
@@ -371,130 +661,218 @@ class RedisChat:
         print(PRIMARY_COLOR + "Chat History (Latest 20 messages)")
         print(PRIMARY_COLOR + "="*60)
         
-        messages = self.get_message_history(20)
+        with self.history_lock:
+            cached = list(islice(self.history, 20)) if self.history_loaded else None
+        
+        if cached is not None:
+            messages = cached
+        else:
+            messages = self.get_message_history(20)
+            if messages is None:
+                # Leave history_loaded unset so the next /history tries again
+                print(ERROR_COLOR + "Could not load chat history, try /history again later.")
+                print(PRIMARY_COLOR + "="*60 + "\n")
+                return
+            with self.history_lock:
+                # After a failed first load the display thread may already have
+                # added live messages; keep those the snapshot doesn't include
+                fetched = set(messages)
+                live = [msg for msg in self.history if msg not in fetched]
+                self.history.clear()
+                self.history.extend(live + messages)
+                self.history_loaded = True
+                messages = list(islice(self.history, 20))
         
         if not messages:
             print(PRIMARY_COLOR + "No messages yet. Be the first to chat!")
         else:
             # Reverse to show oldest first
-            for msg in reversed(messages):
-                self.display_message(msg)
+            self.display_messages_batch(reversed(messages))
         
         print(PRIMARY_COLOR + "="*60 + "\n")
     
+    def handle_new_messages(self, messages):
+        """Notify about and display newly received messages (newest first)"""
+        if messages:
+            with self.history_lock:
+                self.history.extendleft(reversed(messages))
+            
+            # Track senders for @mention completion regardless of notifications,
+            # in one locked update for the whole batch
+            senders = {msg.username for msg in messages} - {"Unknown"}
+            self.update_known_users(senders)
+            
+            # Check if we should notify (background & not own message)
+            if PLYER_AVAILABLE and not self.is_window_focused():
+                # One pass: find the latest relevant message and any mention
+                latest = None
+                notif_title = None
+                for msg in messages:
+                    sender = msg.username
+                    if sender == self.username:
+                        continue
+                                        
+                    text = msg.message
+
+                    # Visibility check for notification
+                    if msg.is_silent and self.username not in msg.recipients:
+                        continue
+                    
+                    # Prioritize the LATEST message (messages[0] is newest)
+                    if latest is None:
+                        latest = (sender, text)
+                    
+                    # Check for mentions in ANY of the messages to upscale the alert
+                    text_lower = text.lower()
+                    if "@everyone" in text_lower:
+                        notif_title = "📢 @everyone Mentioned!"
+                        break
+                    if self.username_mention in text_lower:
+                        notif_title = "🔔 You were mentioned!"
+                        break
+
+                # Notify only ONCE per batch if there are relevant messages
+                if latest:
+                    last_sender, last_text = latest
+                    if notif_title is None:
+                        notif_title = f"New message from {last_sender}"
+
+                    try:
+                        notification.notify(
+                            title=notif_title,
+                            message=f"{last_sender}: {last_text}",
+                            app_name="Redis Chat CLI",
+                            timeout=5
+                        )
+                    except Exception:
+                        pass
+                                        
+            # Display oldest first so a burst reads in order
+            self.display_messages_batch(
+                reversed(messages),
+                header=f"{PRIMARY_COLOR}\n--- New message(s) received ---"
+            )
+    
     def stream_updates(self):
-        """Background thread to check for new messages and update presence"""
-        ONLINE_USERS_KEY = "chat:online_users_zset"
-        last_heartbeat = 0
-        last_cleanup = 0
-        heartbeat_interval = 20  # Send heartbeat every 20 seconds (was: every 1 second via message polling)
-        cleanup_interval = 60    # Cleanup stale users every 60 seconds (was: every 1 second)
+        """Background thread long-polling the chat stream with a blocking XREAD"""
+        min_block_ms = 5000
+        max_block_ms = 30000
+        block_ms = min_block_ms
         
-        while self.running:
+        while not self.stop_event.is_set():
+            # Only the network round trip is retried; anything else is a bug and
+            # should surface rather than be slept through
             try:
-                now = int(time.time())
-                
-                # 1. HEARTBEAT - Only every 20 seconds
-                if self.username and (now - last_heartbeat) >= heartbeat_interval:
-                    self.redis_request("ZADD", [ONLINE_USERS_KEY, str(now), self.username])
-                    last_heartbeat = now
-                
-                # 2. CLEANUP - Only every 60 seconds
-                if (now - last_cleanup) >= cleanup_interval:
-                    cutoff = now - 15
-                    self.redis_request("ZREMRANGEBYSCORE", [ONLINE_USERS_KEY, "-inf", str(cutoff)])
-                    last_cleanup = now
-
-                # 3. MESSAGE CHECK - Every 2-3 seconds (was: every 1 second)
-                result = self.redis_request("LLEN", [CHAT_KEY])
-                
-                if result and result.get("result") is not None:
-                    current_count = result["result"]
-                    
-                    if current_count > self.last_count:
-                        new_messages_count = current_count - self.last_count
-                        messages = self.get_message_history(new_messages_count)
-                        
-                        if messages:
-                            if not PROMPT_TOOLKIT_AVAILABLE:
-                                print(PRIMARY_COLOR + "\n--- New message(s) received ---")
-                            else:
-                                print_formatted_text(ANSI(f"{PRIMARY_COLOR}\n--- New message(s) received ---"))
-                            
-                            # Check if we should notify (background & not own message)
-                            if PLYER_AVAILABLE and not self.is_window_focused():
-                                # Filter messages that are relevant for notification
-                                relevant_msgs = []
-                                for msg in messages:
-                                    sender = msg.get("username", "Unknown")
-                                    if sender != "Unknown":
-                                        self.update_known_users([sender])
-
-                                    if sender == self.username:
-                                        continue
-                                        
-                                    text = msg.get("message", "")
-                                    recipients = msg.get("recipients", [])
-                                    is_silent = msg.get("is_silent", False)
-
-                                    # Visibility check for notification
-                                    if is_silent and self.username not in recipients:
-                                        continue
-                                    
-                                    # Add to potential notifications
-                                    relevant_msgs.append((sender, text))
-
-                                # Notify only ONCE per batch if there are relevant messages
-                                if relevant_msgs:
-                                    # Prioritize the LATEST message (messages[0] is newest)
-                                    last_sender, last_text = relevant_msgs[0]
-                                    
-                                    # Check for mentions in ANY of the messages to upscale the alert
-                                    is_mention = False
-                                    notif_title = "Redis Chat"
-                                    
-                                    # Scan for high priority alerts
-                                    for s, t in relevant_msgs:
-                                        t_lower = t.lower()
-                                        if "@everyone" in t_lower:
-                                            notif_title = "📢 @everyone Mentioned!"
-                                            is_mention = True
-                                            break
-                                        if f"@{self.username.lower()}" in t_lower:
-                                            notif_title = "🔔 You were mentioned!"
-                                            is_mention = True
-                                            break
-                                    
-                                    if not is_mention:
-                                        notif_title = f"New message from {last_sender}"
-
-                                    try:
-                                        notification.notify(
-                                            title=notif_title,
-                                            message=f"{last_sender}: {last_text}",
-                                            app_name="Redis Chat CLI",
-                                            timeout=5
-                                        )
-                                    except Exception:
-                                        pass
-                                        
-                            for msg in messages:
-                                self.display_message(msg)
-                            
-                            # Refresh prompt (Visual only)
-                            # Logic handled by loop below
-                        
-                        self.last_count = current_count
+                if self.last_id is None:
+                    # Start after the newest existing entry so old history isn't replayed
+                    response = self.stream_post(
+                        REDIS_URL,
+                        data=json_body(["XREVRANGE", CHAT_STREAM_KEY, "+", "-", "COUNT", 1]),
+                        timeout=5
+                    )
+                    response.raise_for_status()
+                    entries = json_loads(response.content).get("result")
+                    self.last_id = entries[0][0] if entries else "0-0"
                 
-                time.sleep(2)  # Check for new messages every 2 seconds (reduced from 1s)
+                # Upstash holds the request until new entries exist or BLOCK expires,
+                # so delivery is immediate and an idle chat costs one request per block
+                response = self.stream_post(
+                    REDIS_URL,
+                    data=XREAD_BODY % (block_ms, self.last_id.encode()),
+                    timeout=(5, block_ms / 1000 + 10)
+                )
+                response.raise_for_status()
+                streams = json_loads(response.content).get("result")
+            except (requests.RequestException, ValueError):
+                # ValueError: a 200 whose body isn't JSON, e.g. a proxy error page
+                self.sleep_backoff()
+                continue
+            
+            self.backoff = BACKOFF_MIN
+            
+            # Back off on idle: each empty return lengthens the next block (up to
+            # 30s) to save request quota; any activity drops back to 5s
+            if streams:
+                block_ms = min_block_ms
+            else:
+                block_ms = min(max_block_ms, int(block_ms * 1.5))
+            
+            for _, entries in streams or []:
+                if entries:
+                    self.last_id = entries[-1][0]
+                    # Hand off to display_updates; blocks when the queue is full
+                    self.rx_q.put(entries)
+    
+    def display_updates(self):
+        """Background thread decoding and displaying batches from stream_updates"""
+        while not self.stop_event.is_set():
+            try:
+                entries = self.rx_q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            # One bad batch must not kill the thread: stream_updates would then
+            # block forever once rx_q fills up
+            try:
+                # XREAD returns oldest first; handlers expect newest first
+                messages = self.decode_messages(self.entry_payloads(reversed(entries)))
+                self.handle_new_messages(messages)
             except Exception as e:
-                # print(PRIMARY_COLOR + f"Stream error: {e}") # Suppress noise
-                time.sleep(2)
+                print(ERROR_COLOR + f"Skipped undisplayable messages: {e}")
+    
+    def sleep_backoff(self):
+        """Wait out the reconnect delay plus jitter, then double it (callers reset it on success)"""
+        self.stop_event.wait(self.backoff + random.uniform(0, self.backoff / 2))
+        self.backoff = min(self.backoff * 2, BACKOFF_MAX)
+    
+    def presence_updates(self):
+        """Background thread keeping our heartbeat and the live user count fresh"""
+        # Must stay below the bucket length so every online user lands in every bucket
+        heartbeat_interval = 10
+        # Started after get_username, so the body can be built once up front;
+        # only the bucket number varies per tick
+        key = PRESENCE_KEY_JSON
+        user = json_dumps(self.username).replace("%", "%%")
+        template = (
+            f'[["PFADD",{key},{user}],'
+            # Old buckets expire on their own, no cleanup pass needed
+            f'["EXPIRE",{key},{PRESENCE_BUCKET_SECONDS * 4}],'
+            # PFCOUNT over several keys counts the union, in O(1) for any room size
+            f'["PFCOUNT",{key},{key}]]'
+        ).encode()
+        
+        while not self.stop_event.is_set():
+            bucket = int(time.time()) // PRESENCE_BUCKET_SECONDS
+            # redis_pipeline reports network errors itself and returns None
+            results = self.redis_pipeline(template % (bucket, bucket, bucket, bucket - 1))
+            if results:
+                online = results[-1].get("result")
+                if online:
+                    self.active_user_count = online
+            
+            self.stop_event.wait(heartbeat_interval)
     
     def start_stream_thread(self):
-        """Start background streaming thread"""
+        """Start background streaming, display, presence and sender threads"""
         stream_thread = threading.Thread(target=self.stream_updates, daemon=True)
         stream_thread.start()
+        display_thread = threading.Thread(target=self.display_updates, daemon=True)
+        display_thread.start()
+        presence_thread = threading.Thread(target=self.presence_updates, daemon=True)
+        presence_thread.start()
+        self.sender_thread = threading.Thread(target=self.sender_loop, daemon=True)
+        self.sender_thread.start()
+    
+    def get_prompt(self):
+        """Return the input prompt, cached per live user count"""
+        count, prompt = self.prompt_cache
+        if count != self.active_user_count:
+            count = self.active_user_count
+            prompt = f"{Fore.CYAN}[{Fore.GREEN}Live:{Fore.YELLOW}{count}{Fore.CYAN}] {Fore.GREEN}>>> {Style.RESET_ALL}"
+            if PROMPT_TOOLKIT_AVAILABLE:
+                # ANSI() parses the escapes up front; keep the parsed object
+                prompt = ANSI(prompt)
+            self.prompt_cache = (count, prompt)
+        return prompt
     
     def get_username(self):
         """Get username from user"""
@@ -502,6 +880,7 @@ class RedisChat:
             username = input(PRIMARY_COLOR + "Enter your username: ").strip()
             if username and len(username) <= 20:
                 self.username = username
+                self.username_mention = f"@{username.lower()}"
                 self.register_user() # Register in Redis
                 self.update_known_users([username])
                 print(PRIMARY_COLOR + f"Welcome, {USERNAME_COLOR}{username}{PRIMARY_COLOR}!")
@@ -525,6 +904,34 @@ class RedisChat:
         print(f"{DESC}Any text   - Send a message")
         print(PRIMARY_COLOR + "="*60 + "\n")
 
+    def wait_gemini_result(self, prompt_id, max_wait=30):
+        """Wait for a Gemini result: its JSON, "" on timeout, or None if Redis failed"""
+        deadline = time.monotonic() + max_wait
+        while True:
+            remaining = int(deadline - time.monotonic())
+            if remaining <= 0:
+                return ""
+            # Block server-side until the worker pushes the result. BLPOP also
+            # consumes it, so there's nothing to clean up.
+            window = min(GEMINI_BLPOP_WINDOW, remaining)
+            response = self.redis_request(
+                "BLPOP",
+                [GEMINI_RESULT_KEY.format(prompt_id), window],
+                timeout=window + 5
+            )
+            if response is None:
+                return None
+            if response.get("result"):
+                # Result is [key, value]
+                return response["result"][1]
+            
+            # Older workers SET the result instead of pushing it
+            response = self.redis_request("GETDEL", [GEMINI_LEGACY_RESPONSE_KEY.format(prompt_id)])
+            if response is None:
+                return None
+            if response.get("result"):
+                return response["result"]
+    
     def start_gemini_cli(self):
         """Start interactive Gemini CLI session via Redis backend"""
         print(PRIMARY_COLOR + "\n" + "="*60)
@@ -532,6 +939,10 @@ class RedisChat:
         print(PRIMARY_COLOR + "Type your prompt or " + Fore.MAGENTA + "/exit" + PRIMARY_COLOR + " to return to chat")
         print(PRIMARY_COLOR + "(Powered by Redis backend)")
         print(PRIMARY_COLOR + "="*60 + "\n")
+        
+        # One id per Gemini session: lets the backend keep a single chat / cached
+        # context for the whole conversation instead of rebuilding it per prompt
+        session_id = f"{self.username}_{int(time.time() * 1000)}"
 
         while True:
             try:
@@ -544,44 +955,40 @@ class RedisChat:
                     print(PRIMARY_COLOR + "Exiting Gemini Mode...\n")
                     break
                 
-                # Use Spinner for thinking
-                Effects.spinner("Sending to backend...", duration=0.5)
-                
+                # Spins while the prompt is queued and the backend works on it;
+                # stopped once, before anything is printed
+                result = result_data = error = None
+                self.spinner.start("Waiting for backend...")
                 try:
                     # Push prompt to Redis queue
                     prompt_id = f"{self.username}_{int(time.time() * 1000)}"
-                    self.redis_request("RPUSH", [GEMINI_QUEUE_KEY, json.dumps({
+                    self.redis_request("RPUSH", [GEMINI_QUEUE_KEY, json_dumps({
                         "id": prompt_id,
+                        "session": session_id,
                         "user": self.username,
                         "prompt": user_input,
                         "timestamp": datetime.now().isoformat()
                     })])
-                    
-                    # Poll for response with timeout
-                    response_key = GEMINI_RESPONSE_KEY.format(prompt_id)
-                    max_wait = 30  # 30 seconds
-                    waited = 0
-                    
-                    while waited < max_wait:
-                        response = self.redis_request("GET", [response_key])
-                        if response and response.get("result"):
-                            result_data = json.loads(response["result"])
-                            if "error" in result_data:
-                                print(Fore.RED + f"\nError from backend: {result_data['error']}\n")
-                            else:
-                                print(Fore.WHITE + result_data.get("response", "No response") + "\n")
-                            # Clean up response key
-                            self.redis_request("DEL", [response_key])
-                            break
-                        
-                        time.sleep(0.5)
-                        waited += 0.5
-                    
-                    if waited >= max_wait:
-                        print(Fore.YELLOW + "\nTimeout waiting for backend response (>30s)\n")
-                        
+                    result = self.wait_gemini_result(prompt_id)
+                    if result:
+                        result_data = json_loads(result)
+                        if not isinstance(result_data, dict):
+                            raise ValueError(f"unexpected backend response {result!r:.80}")
                 except Exception as e:
-                    print(Fore.RED + f"\nError: {e}\n")
+                    error = e
+                finally:
+                    self.spinner.stop()
+                
+                if error is not None:
+                    print(Fore.RED + f"\nError: {error}\n")
+                elif result is None:
+                    print(Fore.RED + "\nError: lost connection to Redis while waiting for the backend\n")
+                elif result_data is None:
+                    print(Fore.YELLOW + "\nTimeout waiting for backend response (>30s)\n")
+                elif "error" in result_data:
+                    print(Fore.RED + f"\nError from backend: {result_data['error']}\n")
+                else:
+                    print(Fore.WHITE + str(result_data.get("response") or "No response") + "\n")
                     
             except KeyboardInterrupt:
                 print("\nReturning to main chat...")
@@ -606,20 +1013,18 @@ class RedisChat:
         
         print("\n") # Spacer
         Effects.typewriter("Welcome to Redis Chat CLI...", speed=0.03, color=Fore.GREEN)
-        Effects.spinner("Initializing secure connection...", duration=1.5)
+        # Open the pooled connection while the spinner runs, so the TLS handshake
+        # is paid here rather than on the first message
+        self.spinner.start("Initializing secure connection...")
+        self.redis_request("PING")
+        self.spinner.stop()
         print(PRIMARY_COLOR + "="*60 + "\n")
         
-        # Initialize last_count BEFORE starting thread/loop
-        # Fetch current message count so we don't alert on old history
-        try:
-             result = self.redis_request("LLEN", [CHAT_KEY])
-             self.last_count = result["result"] if (result and result.get("result")) else 0
-        except:
-             self.last_count = 0
-
         self.get_username()
-        self.start_stream_thread()
+        # History first: it seeds the ring buffer and the stream cursor before
+        # the display thread starts appending to them
         self.show_history()
+        self.start_stream_thread()
         self.show_help()
         
         print(PRIMARY_COLOR + "Connected! Type your message or " + Fore.MAGENTA + "/help" + PRIMARY_COLOR + " for commands\n")
@@ -639,26 +1044,22 @@ class RedisChat:
             )
 
         try:
-            while self.running:
+            while not self.stop_event.is_set():
                 try:
-                    # Dynamic colorful prompt
-                    prompt_str = f"[{self.active_user_count}] >>> "
-                    # We'll rely on our custom style for the prompt if possible, or just pass simple ANSI
-                    # For simplicity with current setup, we keep the ANSI prompt but use lexer for input
-                    
-                    ansi_prompt = f"{Fore.CYAN}[{Fore.GREEN}Live:{Fore.YELLOW}{self.active_user_count}{Fore.CYAN}] {Fore.GREEN}>>> {Style.RESET_ALL}"
-                    
+                    # Dynamic colorful prompt, rebuilt only when the live count changes
                     if PROMPT_TOOLKIT_AVAILABLE:
-                         # session.prompt handles the input highlighting via lexer
-                         message = session.prompt(ANSI(ansi_prompt)).strip()
+                         # session.prompt handles the input highlighting via lexer;
+                         # patch_stdout keeps background prints above the prompt (raw keeps colors)
+                         with patch_stdout(raw=True):
+                             message = session.prompt(self.get_prompt()).strip()
                     else:
-                        message = input(ansi_prompt).strip()
+                        message = input(self.get_prompt()).strip()
                     
                     if not message:
                         continue
                     
                     if message.lower() == "/quit":
-                        self.running = False
+                        self.stop_event.set()
                         print(PRIMARY_COLOR + "Goodbye!")
                         break
                     elif message.lower() == "/help":
@@ -671,14 +1072,20 @@ class RedisChat:
                         self.send_message(message)
                 
                 except KeyboardInterrupt:
-                    self.running = False
+                    self.stop_event.set()
                     print(PRIMARY_COLOR + "\nGoodbye!")
                     break
         
         except Exception as e:
             print(PRIMARY_COLOR + f"Error: {e}")
         
-        self.running = False
+        finally:
+            self.stop_event.set()
+            # Give queued messages a moment to go out before closing the pool
+            if self.sender_thread:
+                self.sender_thread.join(timeout=5)
+            self.session.close()
+            self.stream_session.close()
 
 if __name__ == "__main__":
     chat = RedisChat()
@@ -1,5 +1,5 @@
 @echo off
-REM Last Updated: 2026-01-07
+REM Last Updated: 2026-10-15
 REM Description: Quick start script for Redis Chat CLI
 
 echo.